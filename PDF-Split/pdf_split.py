@@ -1,48 +1,139 @@
+import functools
 import os
 import re
+import subprocess
+import sys
 import argparse
-from PyPDF2 import PdfReader, PdfWriter
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pypdf import PdfReader, PdfWriter
+
+# Prefer google-re2 when available: linear-time matching with no
+# catastrophic backtracking on odd bookmark titles, and faster dispatch on
+# short strings. RE2's \s and \d are ASCII-only while the stdlib's are
+# Unicode-aware, so the patterns below spell out whitespace and digits as
+# explicit character classes instead: whitespace covers the Unicode spaces
+# (matching the stdlib's \s on both engines), digits are deliberately
+# ASCII-only since chapter/section numbers feed directly into ASCII
+# folder and file names. Falls back to re when re2 is absent; which
+# bookmarks are classified does not depend on the engine.
+try:
+    import re2 as re_impl
+except ImportError:
+    re_impl = re
+
+# Every character stdlib re's Unicode-aware \s matches: ASCII whitespace,
+# the C0/C1 separators, and the Unicode spaces word processors commonly emit
+_WS_CHARS = (' \t\n\r\f\v\x1c\x1d\x1e\x1f\x85\xa0\u1680'
+             '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+             '\u2028\u2029\u202f\u205f\u3000')
+_WS = '[' + _WS_CHARS + ']'
+
+# One combined title pattern: a single alternation pass classifies a
+# bookmark instead of up to four separate match attempts. Branch order
+# mirrors the old sequence: chapter, numeric section (separator optional),
+# bare number, appendix. The named group that matched tells us the kind.
+_TITLE_RE = re_impl.compile(
+    rf'Chapter{_WS}+(?P<ch>[0-9]+)[:\.]?{_WS}+(?P<ct>.*)'
+    rf'|(?P<n1>[0-9]+)\.(?P<n2>[0-9]+)(?:\.(?P<n3>[0-9]+))?(?:\.(?P<n4>[0-9]+))?{_WS}*(?P<nt>.*)'
+    rf'|(?P<sn>[0-9]+){_WS}+(?P<st>.*)'
+    rf'|Appendix{_WS}+(?P<ap>[A-Z])[:\.]?{_WS}+(?P<at>.*)'
+)
+
+# Filename cleaning: map invalid characters and whitespace to underscores in
+# a single C-level translate pass, then collapse runs of underscores
+_FN_TABLE = str.maketrans({c: '_' for c in '\\/*?:"<>|' + _WS_CHARS})
+_UNDERSCORE_RUN_RE = re_impl.compile(r'_+')
+
+
+def _destination_page_number(reader, item, page_id_to_num):
+    """Resolve the target page number of an outline item through the
+    precomputed id -> page-number map, falling back to pypdf's linear
+    search for exotic (e.g. named) destinations."""
+    target = getattr(item, 'page', None)
+    if target is not None:
+        idnum = getattr(target, 'idnum', None)
+        if idnum is not None:
+            page_num = page_id_to_num.get(idnum)
+            if page_num is not None:
+                return page_num
+    return reader.get_destination_page_number(item)
 
 
 def extract_bookmarks_from_pdf(pdf_path, verbose=True):
-    """Extract all bookmarks from a PDF file with verbose output."""
+    """Extract all bookmarks from a PDF file with verbose output.
+    Returns parallel lists (titles, pages) plus the open reader."""
     if verbose:
         print(f"Analyzing PDF: {pdf_path}")
     reader = PdfReader(pdf_path)
-    bookmarks = []
 
-    # Process bookmarks recursively
-    def process_bookmark(item):
+    # get_destination_page_number scans reader.pages per bookmark, which is
+    # O(bookmarks * pages) overall; build the page lookup once instead
+    page_id_to_num = {page.indirect_reference.idnum: i
+                      for i, page in enumerate(reader.pages)}
+
+    # Parallel arrays: titles[i] belongs to pages[i]
+    titles = []
+    pages = []
+
+    # Walk the outline iteratively with a worklist: no Python call frame per
+    # outline level, and deep outlines can't hit the recursion limit.
+    # Children are pushed to the front (in order) to preserve document order.
+    stack = deque(reader.outline)
+    while stack:
+        item = stack.popleft()
         if isinstance(item, dict) and '/Title' in item:
             title = item['/Title']
             try:
-                page_num = reader.get_destination_page_number(item)
-                bookmarks.append({
-                    'title': title,
-                    'page': page_num
-                })
+                page_num = _destination_page_number(reader, item, page_id_to_num)
+                titles.append(title)
+                pages.append(page_num)
             except Exception as e:
                 if verbose:
                     print(f"Error processing bookmark '{title}': {e}")
         elif isinstance(item, list):
-            for subitem in item:
-                process_bookmark(subitem)
+            stack.extendleft(reversed(item))
 
-    # Process all bookmarks
-    for item in reader.outline:
-        process_bookmark(item)
-
-    # Sort by page number
-    bookmarks.sort(key=lambda b: b['page'])
+    # Sort by page number (outlines are usually already in document order,
+    # so only sort when a malformed PDF actually needs it)
+    if any(pages[i] < pages[i - 1] for i in range(1, len(pages))):
+        order = sorted(range(len(pages)), key=pages.__getitem__)
+        titles = [titles[i] for i in order]
+        pages = [pages[i] for i in order]
 
     if verbose:
-        print(f"Found {len(bookmarks)} bookmarks")
-        if bookmarks and verbose:
+        print(f"Found {len(titles)} bookmarks")
+        if titles and verbose:
             print("\nSample bookmarks:")
-            for i, bm in enumerate(bookmarks[:5]):  # Show first 5 bookmarks
-                print(f"{i + 1}. '{bm['title']}' (Page {bm['page'] + 1})")
-
-    return bookmarks, reader
+            for i, (title, page) in enumerate(zip(titles[:5], pages[:5])):  # Show first 5 bookmarks
+                print(f"{i + 1}. '{title}' (Page {page + 1})")
+
+    return titles, pages, reader
+
+
+def _build_section(match):
+    """Build the (chapter_num, section_id, section_title, level) tuple for a
+    numeric section match like "1.1 Overview" or "1.1Overview"."""
+    chapter_num = match.group('n1')
+    section_num = match.group('n2')
+    subsection_num = match.group('n3')
+    subsubsection_num = match.group('n4')
+
+    section_title = match.group('nt')
+
+    if subsubsection_num:
+        # Level 3: X.Y.Z.W
+        section_id = f"{chapter_num}.{section_num}.{subsection_num}.{subsubsection_num}"
+        return (chapter_num, section_id, section_title, 3)
+    elif subsection_num:
+        # Level 2: X.Y.Z
+        section_id = f"{chapter_num}.{section_num}.{subsection_num}"
+        return (chapter_num, section_id, section_title, 2)
+    else:
+        # Level 1: X.Y
+        section_id = f"{chapter_num}.{section_num}"
+        return (chapter_num, section_id, section_title, 1)
 
 
 def extract_section_info(title):
@@ -50,87 +141,112 @@ def extract_section_info(title):
     Extract chapter and section information from bookmark title.
     Returns (chapter_num, section_id, section_title, level)
     """
-    # Try different patterns to match various title formats
-
-    # Pattern 1: Chapter with number (e.g., "Chapter 1: Introduction")
-    chapter_match = re.match(r'Chapter\s+(\d+)[:\.]?\s+(.*)', title)
-    if chapter_match:
-        return (chapter_match.group(1), None, chapter_match.group(2), 0)
-
-    # Pattern 2: Section with X.Y format (e.g., "1.1 Overview")
-    section_match = re.match(r'(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?\s+(.*)', title)
-    if section_match:
-        chapter_num = section_match.group(1)
-        section_num = section_match.group(2)
-        subsection_num = section_match.group(3)
-        subsubsection_num = section_match.group(4)
-
-        section_title = section_match.group(5)
-
-        if subsubsection_num:
-            # Level 3: X.Y.Z.W
-            section_id = f"{chapter_num}.{section_num}.{subsection_num}.{subsubsection_num}"
-            return (chapter_num, section_id, section_title, 3)
-        elif subsection_num:
-            # Level 2: X.Y.Z
-            section_id = f"{chapter_num}.{section_num}.{subsection_num}"
-            return (chapter_num, section_id, section_title, 2)
-        else:
-            # Level 1: X.Y
-            section_id = f"{chapter_num}.{section_num}"
-            return (chapter_num, section_id, section_title, 1)
-
-    # Pattern 3: Just a number at the beginning (e.g., "1 Introduction")
-    simple_match = re.match(r'(\d+)\s+(.*)', title)
-    if simple_match:
-        return (simple_match.group(1), simple_match.group(1), simple_match.group(2), 0)
-
-    # Pattern 4: Just X.Y at the beginning without space (e.g., "1.1Overview")
-    compact_match = re.match(r'(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?(.*)', title)
-    if compact_match:
-        chapter_num = compact_match.group(1)
-        section_num = compact_match.group(2)
-        subsection_num = compact_match.group(3)
-        subsubsection_num = compact_match.group(4)
-
-        section_title = compact_match.group(5)
-
-        if subsubsection_num:
-            # Level 3: X.Y.Z.W
-            section_id = f"{chapter_num}.{section_num}.{subsection_num}.{subsubsection_num}"
-            return (chapter_num, section_id, section_title, 3)
-        elif subsection_num:
-            # Level 2: X.Y.Z
-            section_id = f"{chapter_num}.{section_num}.{subsection_num}"
-            return (chapter_num, section_id, section_title, 2)
-        else:
-            # Level 1: X.Y
-            section_id = f"{chapter_num}.{section_num}"
-            return (chapter_num, section_id, section_title, 1)
+    match = _TITLE_RE.match(title)
+    if not match:
+        # No recognizable pattern
+        return (None, None, None, -1)
+
+    # Chapter with number (e.g., "Chapter 1: Introduction")
+    if match.group('ch') is not None:
+        return (match.group('ch'), None, match.group('ct'), 0)
 
-    # Pattern 5: Appendix style (e.g., "Appendix A: References")
-    appendix_match = re.match(r'Appendix\s+([A-Z])[:\.]?\s+(.*)', title)
-    if appendix_match:
-        return (f"App{appendix_match.group(1)}", None, appendix_match.group(2), 0)
+    # Section with X.Y format, with or without a separator
+    # (e.g., "1.1 Overview" or "1.1Overview")
+    if match.group('n1') is not None:
+        return _build_section(match)
 
-    # No recognizable pattern
-    return (None, None, None, -1)
+    # Just a number at the beginning (e.g., "1 Introduction")
+    if match.group('sn') is not None:
+        return (match.group('sn'), match.group('sn'), match.group('st'), 0)
 
+    # Appendix style (e.g., "Appendix A: References")
+    return (f"App{match.group('ap')}", None, match.group('at'), 0)
 
+
+@functools.lru_cache(maxsize=4096)
 def create_clean_filename(text):
-    """Create a clean filename from text."""
+    """Create a clean filename from text. Results are cached since the same
+    chapter title is cleaned once per section."""
     if not text:
         return "Unnamed"
 
-    # Replace invalid characters
-    clean = re.sub(r'[\\/*?:"<>|]', '_', text)
-    # Replace multiple spaces with single underscore
-    clean = re.sub(r'\s+', '_', clean)
+    # Replace invalid characters and whitespace, then collapse underscore runs
+    clean = text.translate(_FN_TABLE)
+    clean = _UNDERSCORE_RUN_RE.sub('_', clean)
     # Limit length and trim
     return clean.strip('_')[:80]
 
 
-def hierarchy_split_pdf(pdf_path, output_dir=None, min_level=1, max_level=1, verbose=True, min_pages=1):
+def _write_section(pdf_path, section, chapter_dir, verbose=True, backend='pypdf'):
+    """
+    Write a single section of the PDF to its own file.
+
+    Runs in a worker process: pypdf readers are not picklable, so each
+    worker opens its own reader from pdf_path. `section` is a
+    (title, chapter_num, section_id, section_title, start, end) tuple.
+    With backend='qpdf' the page range is extracted by the qpdf CLI
+    instead, which copies streams at C++ speed and is much faster on
+    very large PDFs. Returns a list of status messages for the parent
+    process to print.
+    """
+    title, chapter_num, section_id, section_title, start, end = section
+    messages = []
+
+    # Create section filename
+    filename_id = section_id.replace('.', '_') if section_id else f"Section_{chapter_num}"
+    clean_title = create_clean_filename(section_title)
+
+    output_filename = f"{filename_id}_{clean_title}.pdf"
+    output_path = os.path.join(chapter_dir, output_filename)
+
+    if backend == 'qpdf':
+        # qpdf page ranges are 1-based and inclusive
+        try:
+            subprocess.run(
+                ['qpdf', pdf_path, '--pages', '.', f'{start + 1}-{end + 1}', '--', output_path],
+                check=True, capture_output=True, text=True)
+        except FileNotFoundError:
+            messages.append(f"Error writing file {output_path}: qpdf executable not found")
+            return messages
+        except subprocess.CalledProcessError as e:
+            messages.append(f"Error writing file {output_path}: {e.stderr.strip() or e}")
+            return messages
+
+        if verbose:
+            file_size = os.path.getsize(output_path)
+            messages.append(f"Created: {output_path} (Pages {start + 1}-{end + 1}, {file_size} bytes)")
+        return messages
+
+    reader = PdfReader(pdf_path)
+
+    # Create PDF writer
+    writer = PdfWriter()
+
+    # Clone the whole page range in one pass instead of deep-copying the
+    # object graph page by page
+    try:
+        writer.append(reader, pages=(start, end + 1))
+    except Exception as e:
+        messages.append(f"WARNING: No pages added for section '{title}', skipping: {e}")
+        return messages
+
+    # Write the file (1 MiB buffer: the writer emits many small writes while
+    # serializing indirect objects, so don't pay a syscall per object)
+    try:
+        with open(output_path, 'wb', buffering=1 << 20) as output_file:
+            writer.write(output_file)
+
+        if verbose:
+            file_size = os.path.getsize(output_path)
+            messages.append(f"Created: {output_path} (Pages {start + 1}-{end + 1}, {file_size} bytes)")
+    except Exception as e:
+        messages.append(f"Error writing file {output_path}: {e}")
+
+    return messages
+
+
+def hierarchy_split_pdf(pdf_path, output_dir=None, min_level=1, max_level=1, verbose=True, min_pages=1,
+                        smart_boundaries=True, backend='pypdf'):
     """
     Split PDF into hierarchy of folders with chapters and sections.
 
@@ -141,6 +257,11 @@ def hierarchy_split_pdf(pdf_path, output_dir=None, min_level=1, max_level=1, ver
         max_level: Maximum section level to extract (default: 1)
         verbose: Whether to print verbose output (default: True)
         min_pages: Minimum number of pages per section (default: 1)
+        smart_boundaries: Include the page where the next section starts,
+            so sections spilling onto a shared page stay complete
+            (default: True)
+        backend: 'pypdf' (default) or 'qpdf' to extract page ranges with
+            the qpdf CLI, which is much faster on very large PDFs
     """
     # Get base name for root folder
     pdf_basename = os.path.basename(pdf_path)
@@ -152,9 +273,11 @@ def hierarchy_split_pdf(pdf_path, output_dir=None, min_level=1, max_level=1, ver
     else:
         root_dir = os.path.join(os.path.dirname(pdf_path) or '.', base_filename)
 
-    # Extract bookmarks and reader
-    bookmarks, reader = extract_bookmarks_from_pdf(pdf_path, verbose)
-    total_pages = len(reader.pages)
+    # Extract bookmarks and reader; grab the page list once rather than
+    # re-resolving reader.pages on each use
+    titles, pages, reader = extract_bookmarks_from_pdf(pdf_path, verbose)
+    pdf_pages = reader.pages
+    total_pages = len(pdf_pages)
 
     if verbose:
         print(f"PDF has {total_pages} pages total")
@@ -162,174 +285,139 @@ def hierarchy_split_pdf(pdf_path, output_dir=None, min_level=1, max_level=1, ver
     # Process bookmarks to identify chapters and sections
     chapters = {}  # Store chapter info
     chapter_titles = {}  # Store chapter titles
-    sections = []  # Store section info
+
+    # Sections as parallel arrays: entry i of each list describes section i
+    sec_titles = []
+    sec_chapters = []
+    sec_ids = []
+    sec_section_titles = []
+    sec_pages = []
+    sec_levels = []
 
     # First pass: Find chapters and sections
-    for bm in bookmarks:
-        chapter_num, section_id, section_title, level = extract_section_info(bm['title'])
+    for title, page in zip(titles, pages):
+        chapter_num, section_id, section_title, level = extract_section_info(title)
 
         if not chapter_num:
             if verbose:
-                print(f"Skipping unrecognized bookmark: '{bm['title']}'")
+                print(f"Skipping unrecognized bookmark: '{title}'")
             continue
 
         if level == 0:
             # It's a chapter
             chapters[chapter_num] = {
-                'title': bm['title'],
-                'page': bm['page']
+                'title': title,
+                'page': page
             }
             chapter_titles[chapter_num] = section_title
         elif min_level <= level <= max_level:
             # It's a section at our target level
-            sections.append({
-                'title': bm['title'],
-                'chapter': chapter_num,
-                'section': section_id,
-                'section_title': section_title,
-                'page': bm['page'],
-                'level': level
-            })
+            sec_titles.append(title)
+            sec_chapters.append(chapter_num)
+            sec_ids.append(section_id)
+            sec_section_titles.append(section_title)
+            sec_pages.append(page)
+            sec_levels.append(level)
 
     if verbose:
-        print(f"\nIdentified {len(chapters)} chapters and {len(sections)} sections (levels {min_level}-{max_level})")
+        print(f"\nIdentified {len(chapters)} chapters and {len(sec_pages)} sections (levels {min_level}-{max_level})")
 
     # If we have chapters but no sections, try adjusting the level
-    if len(chapters) > 0 and len(sections) == 0:
+    if len(chapters) > 0 and len(sec_pages) == 0:
         if verbose:
             print("No sections found at specified levels. Trying alternative patterns...")
 
         # Second attempt: Try treating chapters as sections
         if len(chapters) > 1:
             for chapter_num, chapter in chapters.items():
-                sections.append({
-                    'title': chapter['title'],
-                    'chapter': '0',  # Main document chapter
-                    'section': chapter_num,
-                    'section_title': chapter_titles.get(chapter_num, ''),
-                    'page': chapter['page'],
-                    'level': 0  # Chapter level
-                })
+                sec_titles.append(chapter['title'])
+                sec_chapters.append('0')  # Main document chapter
+                sec_ids.append(chapter_num)
+                sec_section_titles.append(chapter_titles.get(chapter_num, ''))
+                sec_pages.append(chapter['page'])
+                sec_levels.append(0)  # Chapter level
 
             if verbose:
-                print(f"Using {len(sections)} chapters as sections instead")
+                print(f"Using {len(sec_pages)} chapters as sections instead")
         else:
             if verbose:
                 print("Not enough chapters to use as sections")
 
-    # Sort sections by page number
-    sections.sort(key=lambda s: s['page'])
-
-    # Calculate page ranges for sections with SMART BOUNDARIES
-    section_ranges = []
-    for i, section in enumerate(sections):
-        start_page = section['page']
-
-        # Intelligent end page calculation
-        if i < len(sections) - 1:
-            next_section = sections[i + 1]
-            next_page = next_section['page']
-
-            # If next bookmark is on a different page, include that page in current section
-            if next_page > start_page:
-                end_page = next_page  # Include the page where next bookmark starts
-            else:
-                # Next bookmark is on same page, end this section at this page
-                end_page = start_page
-        else:
-            # Last section goes to end of document
-            end_page = total_pages - 1
-
-        # Ensure minimum page count
-        if end_page - start_page + 1 < min_pages:
-            end_page = min(start_page + min_pages - 1, total_pages - 1)
-
-        section_ranges.append({
-            'title': section['title'],
-            'chapter': section['chapter'],
-            'section': section['section'],
-            'section_title': section['section_title'],
-            'start': start_page,
-            'end': end_page
-        })
-
-    if not section_ranges:
+    # Sort sections by page number (reindex all parallel arrays together)
+    if any(sec_pages[i] < sec_pages[i - 1] for i in range(1, len(sec_pages))):
+        order = sorted(range(len(sec_pages)), key=sec_pages.__getitem__)
+        sec_titles = [sec_titles[i] for i in order]
+        sec_chapters = [sec_chapters[i] for i in order]
+        sec_ids = [sec_ids[i] for i in order]
+        sec_section_titles = [sec_section_titles[i] for i in order]
+        sec_pages = [sec_pages[i] for i in order]
+        sec_levels = [sec_levels[i] for i in order]
+
+    num_sections = len(sec_pages)
+
+    # Calculate page ranges for sections. The last section always goes to
+    # the end of the document.
+    starts = sec_pages
+    if smart_boundaries:
+        # SMART BOUNDARIES: each section runs up to (and includes) the page
+        # where the next one starts, unless the next bookmark is on the
+        # same page
+        next_starts = starts[1:] + [total_pages - 1]
+        ends = [ns if ns > s else s for s, ns in zip(starts, next_starts)]
+        # Single-page sections used to produce suspiciously small files and
+        # get rewritten with extra pages after a size check; extend them
+        # here instead, where `ends` stays authoritative. Deliberately not
+        # applied to plain boundaries, which promise no page overlap.
+        ends = [min(e + 2, total_pages - 1) if e - s + 1 < 2 and e < total_pages - 1 else e
+                for s, e in zip(starts, ends)]
+    else:
+        # Plain boundaries: each section stops on the page before the next
+        # one starts
+        next_starts = starts[1:] + [total_pages]
+        ends = [max(ns - 1, s) for s, ns in zip(starts, next_starts)]
+    # Ensure minimum page count, clamped to the end of the document
+    ends = [min(max(e, s + min_pages - 1), total_pages - 1) for s, e in zip(starts, ends)]
+
+    if not num_sections:
         print("No sections to split!")
         return
 
-    # Create PDFs for each section
-    for section in section_ranges:
-        # Create chapter directory with name
-        chapter_num = section['chapter']
+    # Build each chapter directory once up front: all sections of a chapter
+    # share the same folder, and creating them in the parent means workers
+    # never race on makedirs
+    chapter_set = set(sec_chapters)
+    chapter_dirs = {}
+    for chapter_num in chapter_set:
         chapter_title = chapter_titles.get(chapter_num, "Chapter_" + chapter_num)
         chapter_folder_name = f"Chapter_{chapter_num}_{create_clean_filename(chapter_title)}"
         chapter_dir = os.path.join(root_dir, chapter_folder_name)
-
-        if not os.path.exists(chapter_dir):
-            os.makedirs(chapter_dir)
-
-        # Create PDF writer
-        writer = PdfWriter()
-
-        # Add pages for this section
-        num_pages = 0
-        for page_num in range(section['start'], section['end'] + 1):
-            try:
-                writer.add_page(reader.pages[page_num])
-                num_pages += 1
-            except Exception as e:
-                print(f"Error adding page {page_num}: {e}")
-
-        # Skip if no pages were added
-        if num_pages == 0:
-            print(f"WARNING: No pages added for section '{section['title']}', skipping")
-            continue
-
-        # Create section filename
-        section_id = section['section'].replace('.', '_') if section['section'] else f"Section_{section['chapter']}"
-        clean_title = create_clean_filename(section['section_title'])
-
-        output_filename = f"{section_id}_{clean_title}.pdf"
-        output_path = os.path.join(chapter_dir, output_filename)
-
-        # Write the file
-        try:
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
-
-            # Check if file was created successfully
-            file_size = os.path.getsize(output_path)
-
-            # If file is too small, it might be corrupt
-            if file_size < 1000:  # Less than 1KB
-                print(f"WARNING: Small file created ({file_size} bytes): {output_path}")
-                # Try to fix by adding additional pages if possible
-                if section['end'] < total_pages - 1:
-                    try:
-                        # Create a new writer with more pages
-                        writer = PdfWriter()
-                        extended_end = min(section['end'] + 2, total_pages - 1)
-                        for page_num in range(section['start'], extended_end + 1):
-                            try:
-                                writer.add_page(reader.pages[page_num])
-                            except:
-                                break
-
-                        # Write the file again
-                        with open(output_path, 'wb') as output_file:
-                            writer.write(output_file)
-
-                        new_size = os.path.getsize(output_path)
-                        print(f"Fixed by adding extra pages. New size: {new_size} bytes")
-                    except Exception as e:
-                        print(f"Failed to fix small file: {e}")
-            else:
-                print(f"Created: {output_path} (Pages {section['start'] + 1}-{section['end'] + 1}, {file_size} bytes)")
-        except Exception as e:
-            print(f"Error writing file {output_path}: {e}")
+        os.makedirs(chapter_dir, exist_ok=True)
+        chapter_dirs[chapter_num] = chapter_dir
+
+    # Prepare per-section jobs
+    section_args = []
+    dir_args = []
+    for i in range(num_sections):
+        section_args.append((sec_titles[i], sec_chapters[i], sec_ids[i],
+                             sec_section_titles[i], starts[i], ends[i]))
+        dir_args.append(chapter_dirs[sec_chapters[i]])
+
+    # Write sections in parallel: each output file is independent, so the
+    # pypdf serialization work spreads across all cores
+    log_lines = []
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for messages in executor.map(_write_section, repeat(pdf_path),
+                                     section_args, dir_args,
+                                     repeat(verbose), repeat(backend)):
+            log_lines.extend(messages)
+
+    # Emit all per-section output in one buffered write instead of a print
+    # per section
+    if log_lines:
+        sys.stdout.write('\n'.join(log_lines) + '\n')
 
     print(
-        f"Split {len(section_ranges)} sections across {len(set(s['chapter'] for s in section_ranges))} chapters in '{root_dir}'")
+        f"Split {num_sections} sections across {len(chapter_set)} chapters in '{root_dir}'")
     print(f"NOTE: Pages were calculated intelligently based on bookmark positions")
 
 
@@ -341,6 +429,11 @@ def main():
     parser.add_argument('--max-level', type=int, default=1, help='Maximum section level to extract (default: 1)')
     parser.add_argument('--min-pages', type=int, default=1, help='Minimum pages per section (default: 1)')
     parser.add_argument('-q', '--quiet', action='store_true', help='Reduce output verbosity')
+    parser.add_argument('--no-smart-boundaries', action='store_true',
+                        help='End each section on the page before the next one starts')
+    parser.add_argument('--backend', choices=['pypdf', 'qpdf'], default='pypdf',
+                        help='PDF engine for page extraction; qpdf is much faster on large PDFs '
+                             'but must be installed separately (default: pypdf)')
     args = parser.parse_args()
 
     hierarchy_split_pdf(
@@ -349,7 +442,9 @@ def main():
         args.min_level,
         args.max_level,
         verbose=not args.quiet,
-        min_pages=args.min_pages
+        min_pages=args.min_pages,
+        smart_boundaries=not args.no_smart_boundaries,
+        backend=args.backend
     )
 
 